@@ -6,11 +6,11 @@ from sqlalchemy import create_engine, Column, Integer, String, Boolean
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from passlib.context import CryptContext
-from jose import jwt
+from jose import jwt, JWTError
 from datetime import datetime, timedelta
 from db import User
 
-from config import Config
+from config import Config, require_secret_key
 
 
 
@@ -54,7 +54,15 @@ class AuthManager:
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(minutes=Config.ACCESS_TOKEN_EXPIRE_MINUTES)
         to_encode.update({"exp": expire})
-        return jwt.encode(to_encode, Config.SECRET_KEY, algorithm=Config.ALGORITHM)
+        return jwt.encode(to_encode, require_secret_key(), algorithm=Config.ALGORITHM)
+    
+    @staticmethod
+    def decode_access_token(token):
+        # Signature and expiry are both checked; None means re-authenticate
+        try:
+            return jwt.decode(token, require_secret_key(), algorithms=[Config.ALGORITHM])
+        except JWTError:
+            return None
     
     @staticmethod
     def generate_verification_code():
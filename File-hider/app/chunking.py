@@ -0,0 +1,79 @@
+import hashlib
+import hmac
+import io
+import mmap
+import os
+
+from fastcdc import fastcdc
+
+from config import require_secret_key
+
+# Chunk size bounds for content-defined chunking. Boundaries depend only on
+# the bytes around them, so an edit moves at most the chunks it touches.
+MIN_CHUNK_SIZE = 16 * 1024
+AVG_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 256 * 1024
+
+
+def _cut_chunks(data):
+    """Yield the content-defined chunks of a bytes-like object"""
+    if not data:
+        return
+
+    chunks = fastcdc(
+        data,
+        min_size=MIN_CHUNK_SIZE,
+        avg_size=AVG_CHUNK_SIZE,
+        max_size=MAX_CHUNK_SIZE,
+        fat=True
+    )
+    try:
+        for chunk in chunks:
+            yield chunk.data
+    finally:
+        # Release fastcdc's view of `data` so a mapping can be closed
+        chunks.close()
+
+
+def iter_chunks(stream):
+    """
+    Split a binary stream into content-defined chunks
+
+    Cut points are found by the compiled FastCDC implementation. Real files
+    are memory-mapped rather than read, so large files are never loaded
+    into memory as a whole. The mapping is closed as soon as iteration
+    ends, including when the caller stops early.
+
+    Args:
+        stream: File object opened in binary mode
+
+    Yields:
+        bytes: Consecutive chunks covering the whole stream
+    """
+    try:
+        fileno = stream.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        yield from _cut_chunks(stream.read())
+        return
+
+    # mmap refuses empty files, which simply have no chunks
+    if os.fstat(fileno).st_size == 0:
+        return
+    with mmap.mmap(fileno, 0, access=mmap.ACCESS_READ) as data:
+        yield from _cut_chunks(data)
+
+
+def chunk_digest(chunk):
+    """
+    Keyed digest identifying a chunk's plaintext
+
+    Keyed with the application secret so the stored digests do not reveal
+    which well-known content a hidden file contains.
+
+    Args:
+        chunk (bytes): Chunk plaintext
+
+    Returns:
+        str: Hex digest, also used as the chunk's blob filename
+    """
+    return hmac.new(require_secret_key().encode(), chunk, hashlib.sha256).hexdigest()
@@ -0,0 +1,195 @@
+import os
+import time
+from cryptography.exceptions import InvalidTag
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, ChaCha20Poly1305
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from config import Config, require_secret_key
+
+# Raw-binary blobs start with this magic followed by a one-byte suite id.
+# Fernet tokens are base64 and always start with b'gAAAAA', so the two
+# formats cannot be confused.
+BLOB_MAGIC = b'FH'
+HEADER_SIZE = len(BLOB_MAGIC) + 1
+NONCE_SIZE = 12
+TAG_SIZE = 16
+
+
+class InvalidCiphertext(Exception):
+    """Raised when a blob fails authentication or has an unknown format"""
+
+
+def _derive_key(label):
+    """Derive a 256-bit key for one suite from the application secret"""
+    return HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=b'file-hider ' + label.encode()
+    ).derive(require_secret_key().encode())
+
+
+class FernetSuite:
+    """AES-128-CBC + HMAC-SHA256, base64 encoded. Kept for existing blobs."""
+
+    name = 'fernet'
+
+    def __init__(self, key=None):
+        self.fernet = Fernet(key or Config.SECRET_KEY)
+
+    @staticmethod
+    def generate_key():
+        return Fernet.generate_key()
+
+    def encrypt(self, data):
+        return self.fernet.encrypt(data)
+
+    def decrypt(self, blob):
+        try:
+            return self.fernet.decrypt(blob)
+        except InvalidToken:
+            raise InvalidCiphertext("authentication failed")
+
+
+class AEADSuite:
+    """
+    Raw-binary AEAD blob: magic, suite id, nonce, then ciphertext and tag
+
+    The header is passed as associated data, so a blob cannot be replayed
+    under a different suite id.
+    """
+
+    name = None
+    suite_id = None
+    aead_class = None
+
+    def __init__(self, key=None):
+        self.aead = self.aead_class(key or _derive_key(self.name))
+        self.header = BLOB_MAGIC + bytes([self.suite_id])
+
+    @staticmethod
+    def generate_key():
+        return os.urandom(32)
+
+    def encrypt(self, data):
+        nonce = os.urandom(NONCE_SIZE)
+        return self.header + nonce + self.aead.encrypt(nonce, data, self.header)
+
+    def decrypt(self, blob):
+        # A short blob would give the AEAD a short nonce, which it rejects
+        # with ValueError rather than an authentication failure
+        if len(blob) < HEADER_SIZE + NONCE_SIZE + TAG_SIZE:
+            raise InvalidCiphertext("blob is truncated")
+        nonce = blob[HEADER_SIZE:HEADER_SIZE + NONCE_SIZE]
+        try:
+            return self.aead.decrypt(nonce, blob[HEADER_SIZE + NONCE_SIZE:], self.header)
+        except InvalidTag:
+            raise InvalidCiphertext("authentication failed")
+
+
+class AESGCMSuite(AEADSuite):
+    name = 'aes-256-gcm'
+    suite_id = 1
+    aead_class = AESGCM
+
+
+class ChaCha20Poly1305Suite(AEADSuite):
+    name = 'chacha20-poly1305'
+    suite_id = 2
+    aead_class = ChaCha20Poly1305
+
+
+SUITES = {
+    suite.name: suite
+    for suite in (FernetSuite, AESGCMSuite, ChaCha20Poly1305Suite)
+}
+AEAD_SUITES = {
+    suite.suite_id: suite
+    for suite in (AESGCMSuite, ChaCha20Poly1305Suite)
+}
+
+
+class BlobCipher:
+    """
+    Encrypts with the configured suite and decrypts any supported blob
+
+    The suite used for a blob is recorded in its header, so changing
+    `CIPHER_SUITE` only affects newly written blobs.
+    """
+
+    def __init__(self, suite_name=None):
+        suite_name = suite_name or Config.CIPHER_SUITE
+        if suite_name not in SUITES:
+            raise ValueError(f"Unknown cipher suite: {suite_name}")
+        self.suite_name = suite_name
+        self._suites = {}
+
+    def _suite(self, name):
+        # Suites are built lazily: a Fernet instance needs SECRET_KEY to be
+        # a Fernet key, which deployments using only AEAD suites may not have
+        if name not in self._suites:
+            self._suites[name] = SUITES[name]()
+        return self._suites[name]
+
+    def encrypt(self, data):
+        return self._suite(self.suite_name).encrypt(data)
+
+    def decrypt(self, blob):
+        if blob[:len(BLOB_MAGIC)] != BLOB_MAGIC:
+            try:
+                fernet = self._suite(FernetSuite.name)
+            except ValueError:
+                # SECRET_KEY is not a Fernet key, so no Fernet blob can exist
+                raise InvalidCiphertext("not a supported blob format")
+            return fernet.decrypt(blob)
+
+        suite_id = blob[len(BLOB_MAGIC)] if len(blob) > len(BLOB_MAGIC) else None
+        if suite_id not in AEAD_SUITES:
+            raise InvalidCiphertext(f"unknown cipher suite id: {suite_id}")
+        return self._suite(AEAD_SUITES[suite_id].name).decrypt(blob)
+
+
+def benchmark_suites(payload_size=64 * 1024, total_size=64 * 1024 * 1024):
+    """
+    Measure throughput and storage overhead of every cipher suite
+
+    Suites run with throwaway keys, so the result does not depend on the
+    configured SECRET_KEY.
+
+    Args:
+        payload_size (int): Size of each encrypted blob, e.g. one chunk
+        total_size (int): Bytes to push through each suite
+
+    Returns:
+        list: One dict per suite with encrypt/decrypt MB/s and overhead
+    """
+    payload = os.urandom(payload_size)
+    rounds = max(1, total_size // payload_size)
+    megabytes = rounds * payload_size / (1024 * 1024)
+    results = []
+
+    for name, suite_class in SUITES.items():
+        suite = suite_class(suite_class.generate_key())
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            blob = suite.encrypt(payload)
+        encrypt_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            suite.decrypt(blob)
+        decrypt_seconds = time.perf_counter() - start
+
+        overhead = len(blob) - payload_size
+        results.append({
+            'suite': name,
+            'encrypt_mb_s': megabytes / encrypt_seconds,
+            'decrypt_mb_s': megabytes / decrypt_seconds,
+            'overhead_bytes': overhead,
+            'overhead_percent': overhead * 100 / payload_size
+        })
+
+    return results
@@ -4,6 +4,9 @@ from dotenv import load_dotenv
 # Load environment variables
 load_dotenv()
 
+# Placeholder shipped as the SECRET_KEY default; it is public, so never usable
+PLACEHOLDER_SECRET_KEY = 'your-secret-key'
+
 class Config:
     # Database Configuration
     DB_HOST = os.getenv('DB_HOST', 'mysql')
@@ -21,10 +24,43 @@ class Config:
     SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
     
     # Security
-    SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key')
+    SECRET_KEY = os.getenv('SECRET_KEY', PLACEHOLDER_SECRET_KEY)
     ALGORITHM = 'HS256'
-    ACCESS_TOKEN_EXPIRE_MINUTES = 30
+    ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', 30))
+    
+    # Cached login session
+    SESSION_FILE = os.getenv('SESSION_FILE', os.path.expanduser('~/.file_hider/session'))
+    SESSION_CACHE_TTL_SECONDS = int(os.getenv('SESSION_CACHE_TTL_SECONDS', 60))
+    
+    # Cipher suite for newly written blobs: aes-256-gcm, chacha20-poly1305 or fernet
+    CIPHER_SUITE = os.getenv('CIPHER_SUITE', 'aes-256-gcm')
 
     # File Storage
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', '/app/uploads')
-    HIDDEN_FOLDER = os.getenv('HIDDEN_FOLDER', '/app/hidden')
\ No newline at end of file
+    HIDDEN_FOLDER = os.getenv('HIDDEN_FOLDER', '/app/hidden')
+
+    # Integrity Scrubbing
+    # Dot-prefixed paths inside the mounted hidden volume persist across
+    # container rebuilds and are skipped when the scrubber lists blobs
+    QUARANTINE_FOLDER = os.getenv('QUARANTINE_FOLDER', os.path.join(HIDDEN_FOLDER, '.quarantine'))
+    SCRUB_STATE_FILE = os.getenv('SCRUB_STATE_FILE', os.path.join(HIDDEN_FOLDER, '.scrub_state.json'))
+    SCRUB_WORKERS = int(os.getenv('SCRUB_WORKERS', 4))
+    SCRUB_MAX_BYTES_PER_SEC = int(os.getenv('SCRUB_MAX_BYTES_PER_SEC', 50 * 1024 * 1024))
+    # Hide and update write blobs before committing their rows, so younger
+    # unreferenced blobs may belong to one still in progress
+    SCRUB_ORPHAN_MIN_AGE_SECONDS = int(os.getenv('SCRUB_ORPHAN_MIN_AGE_SECONDS', 3600))
+
+
+def require_secret_key():
+    """
+    Return SECRET_KEY, refusing the empty or placeholder value
+
+    Encryption keys, chunk digests and login tokens are all derived from
+    it, so running with the public placeholder would protect nothing.
+
+    Returns:
+        str: The configured secret key
+    """
+    if not Config.SECRET_KEY or Config.SECRET_KEY == PLACEHOLDER_SECRET_KEY:
+        raise RuntimeError("SECRET_KEY is not set; configure a secret before running File Hider")
+    return Config.SECRET_KEY
@@ -18,6 +18,7 @@ class User(Base):
     password_hash = Column(String)
     is_verified = Column(Boolean, default=False)
     verification_code = Column(String)
+    token_version = Column(Integer, default=0)
 
 
 class HiddenFile(Base):
@@ -28,4 +29,14 @@ class HiddenFile(Base):
     original_filename = Column(String)
     hidden_filename = Column(String)
     file_path = Column(String)
-    hidden_at = Column(DATETIME, default=datetime.datetime.utcnow())
\ No newline at end of file
+    hidden_at = Column(DATETIME, default=datetime.datetime.utcnow())
+
+
+class HiddenFileChunk(Base):
+    __tablename__ = "hidden_file_chunks"
+    
+    id = Column(Integer, primary_key=True)
+    hidden_file_id = Column(Integer, ForeignKey('hidden_files.id'), index=True)
+    seq = Column(Integer)
+    chunk_digest = Column(String)
+    size = Column(Integer)
\ No newline at end of file
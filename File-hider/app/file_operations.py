@@ -1,9 +1,11 @@
 import os
+import shutil
 import uuid
-from cryptography.fernet import Fernet
 from sqlalchemy.orm import Session
 
-from db import HiddenFile,User
+from db import HiddenFile,HiddenFileChunk,User
+from chunking import iter_chunks, chunk_digest
+from ciphers import BlobCipher
 from config import Config
 from rich.console import Console
 console = Console()
@@ -13,24 +15,57 @@ class FileHider:
         self.user_id = user_id
         self.upload_folder = upload_folder
         self.hidden_folder = hidden_folder
-        self.encryption_key = Config.SECRET_KEY
-        self.cipher_suite = Fernet(self.encryption_key)
+        self.cipher_suite = BlobCipher(Config.CIPHER_SUITE)
     
+    def _store_chunks(self, file_path, chunk_dir, existing_digests=()):
+        """
+        Chunk a file and write encrypted chunks into `chunk_dir`
+
+        Chunks whose digest is in `existing_digests` are already stored in
+        `chunk_dir` and are not re-encrypted.
+
+        Returns:
+            list: (seq, digest, size) for every chunk in file order
+        """
+        os.makedirs(chunk_dir, exist_ok=True)
+        stored = set(existing_digests)
+        chunks = []
+        with open(file_path, 'rb') as file:
+            for seq, chunk in enumerate(iter_chunks(file)):
+                digest = chunk_digest(chunk)
+                if digest not in stored:
+                    with open(os.path.join(chunk_dir, digest), 'wb') as chunk_file:
+                        chunk_file.write(self.cipher_suite.encrypt(chunk))
+                    stored.add(digest)
+                chunks.append((seq, digest, len(chunk)))
+        return chunks
+
+    def _add_chunk_records(self, hidden_file_id, chunks, db: Session):
+        for seq, digest, size in chunks:
+            db.add(HiddenFileChunk(
+                hidden_file_id=hidden_file_id,
+                seq=seq,
+                chunk_digest=digest,
+                size=size
+            ))
+
+    def _get_hidden_file(self, file_id, db: Session):
+        hidden_file = db.query(HiddenFile).filter(
+            HiddenFile.id == file_id,
+            HiddenFile.user_id == self.user_id
+        ).first()
+        
+        if not hidden_file:
+            raise ValueError("File not found or unauthorized")
+        return hidden_file
+
     def hide_file(self, file_path, db: Session):
         # Generate unique hidden filename
         hidden_filename = str(uuid.uuid4())
         
-        # Read original file
-        with open(file_path, 'rb') as file:
-            file_data = file.read()
-        
-        # Encrypt file
-        encrypted_data = self.cipher_suite.encrypt(file_data)
-        
-        # Save encrypted file in hidden folder
+        # Encrypt file chunk by chunk into its own hidden directory
         hidden_path = os.path.join(self.hidden_folder, hidden_filename)
-        with open(hidden_path, 'wb') as hidden_file:
-            hidden_file.write(encrypted_data)
+        chunks = self._store_chunks(file_path, hidden_path)
         
         # Store file metadata in database
         hidden_file_record = HiddenFile(
@@ -40,6 +75,8 @@ class FileHider:
             file_path=hidden_path
         )
         db.add(hidden_file_record)
+        db.flush()
+        self._add_chunk_records(hidden_file_record.id, chunks, db)
         db.commit()
         
         # Optional: Remove original file
@@ -47,16 +84,69 @@ class FileHider:
         
         return hidden_filename
     
+    def update_hidden_file(self, file_id, file_path, db: Session):
+        """
+        Replace a hidden file's content with a new version of the file
+
+        Only chunks that are not already stored are encrypted and written,
+        and the `HiddenFile` record keeps its id. Files hidden before
+        chunked storage are converted on their first update.
+
+        Args:
+            file_id: Id of the hidden file to update
+            file_path (str): Path to the new version of the file
+            db (Session): Database session
+
+        Returns:
+            dict: Number of chunks in the new version and how many were written
+        """
+        hidden_file = self._get_hidden_file(file_id, db)
+        old_chunks = db.query(HiddenFileChunk).filter_by(
+            hidden_file_id=hidden_file.id
+        ).all()
+        old_digests = {chunk.chunk_digest for chunk in old_chunks}
+        
+        legacy_path = None
+        if os.path.isfile(hidden_file.file_path):
+            # Single-blob file: move to a fresh chunk directory
+            legacy_path = hidden_file.file_path
+            hidden_file.hidden_filename = str(uuid.uuid4())
+            hidden_file.file_path = os.path.join(
+                self.hidden_folder,
+                hidden_file.hidden_filename
+            )
+        
+        try:
+            chunks = self._store_chunks(file_path, hidden_file.file_path, old_digests)
+            new_digests = {digest for _, digest, _ in chunks}
+            
+            for chunk in old_chunks:
+                db.delete(chunk)
+            self._add_chunk_records(hidden_file.id, chunks, db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        # Drop chunks the new version no longer references
+        for digest in old_digests - new_digests:
+            os.remove(os.path.join(hidden_file.file_path, digest))
+        if legacy_path:
+            os.remove(legacy_path)
+        
+        os.remove(file_path)
+        
+        return {
+            "chunks": len(chunks),
+            "written": len(new_digests - old_digests)
+        }
+    
     def unhide_file(self, file_id, db: Session):
         # Retrieve file metadata from database
-
-        hidden_file = db.query(HiddenFile).filter(
-            HiddenFile.id == file_id,
-            HiddenFile.user_id == self.user_id
-        ).first()
+        hidden_file = self._get_hidden_file(file_id, db)
         
-        if not hidden_file:
-            raise ValueError("File not found or unauthorized")
+        if os.path.isdir(hidden_file.file_path):
+            return self._unhide_chunked_file(hidden_file, db)
         
         # Read encrypted file
         with open(hidden_file.file_path, 'rb') as encrypted_file:
@@ -91,3 +181,42 @@ class FileHider:
         
         return restored_path
 
+    def _unhide_chunked_file(self, hidden_file, db: Session):
+        chunks = db.query(HiddenFileChunk).filter_by(
+            hidden_file_id=hidden_file.id
+        ).order_by(HiddenFileChunk.seq).all()
+        
+        restored_path = os.path.join(
+            self.upload_folder,
+            hidden_file.original_filename
+        )
+        
+        # Decrypt chunks in order into the upload folder
+        try:
+            with open(restored_path, 'wb') as restored_file:
+                for chunk in chunks:
+                    chunk_path = os.path.join(hidden_file.file_path, chunk.chunk_digest)
+                    with open(chunk_path, 'rb') as encrypted_chunk:
+                        plaintext = self.cipher_suite.decrypt(encrypted_chunk.read())
+                    # Chunks are named by digest, so a swapped chunk file shows up here
+                    if chunk_digest(plaintext) != chunk.chunk_digest:
+                        raise ValueError(f"Chunk {chunk.seq} does not match its digest")
+                    restored_file.write(plaintext)
+        except Exception as e:
+            console.print(f"[red]Error decrypting file: {e}[/red]")
+            if os.path.exists(restored_path):
+                os.remove(restored_path)
+            return None
+        
+        # Chunk rows must go before the parent row, which they reference
+        db.query(HiddenFileChunk).filter(
+            HiddenFileChunk.hidden_file_id == hidden_file.id
+        ).delete()
+        db.flush()
+        db.delete(hidden_file)
+        db.commit()
+        
+        # Remove hidden chunks only once the rows are gone
+        shutil.rmtree(hidden_file.file_path)
+        
+        return restored_path
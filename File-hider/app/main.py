@@ -2,13 +2,17 @@ import os
 import sys
 from rich.console import Console
 from rich.prompt import Prompt, Confirm
+from rich.table import Table
 from sqlalchemy.orm import Session
 
 # Import local modules
-from config import Config
+from config import Config, require_secret_key
 from auth import AuthManager, User
 from email_verification import EmailVerificationService
 from file_operations import FileHider, HiddenFile
+from scrubber import FileScrubber
+from ciphers import benchmark_suites
+from session import SessionManager
 
 # Database setup
 from sqlalchemy import create_engine
@@ -25,6 +29,7 @@ class FileHiderApp:
     def __init__(self):
         self.db = SessionLocal()
         self.current_user = None
+        self.session = SessionManager()
 
     def _clear_screen(self):
         """Clear console screen"""
@@ -81,6 +86,12 @@ class FileHiderApp:
             
             # Successful login
             self.current_user = user
+            try:
+                self.session.save(user)
+            except OSError as e:
+                # The password already checked out; caching it is only a shortcut
+                console.print(f"[yellow]Could not cache login session: {e}[/yellow]")
+                self._pause()
             self._user_dashboard()
         
         except Exception as e:
@@ -200,22 +211,32 @@ class FileHiderApp:
             console.print("\nUser Dashboard:")
             console.print("1. Hide File")
             console.print("2. Unhide File")
-            console.print("3. List Hidden Files")
-            console.print("4. Verify Email")
-            console.print("5. Logout")
+            console.print("3. Update Hidden File")
+            console.print("4. List Hidden Files")
+            console.print("5. Verify Email")
+            console.print("6. Logout")
+            console.print("7. Logout Everywhere")
             
-            choice = Prompt.ask("Enter your choice", choices=['1', '2', '3', '4', '5'])
+            choice = Prompt.ask("Enter your choice", choices=['1', '2', '3', '4', '5', '6', '7'])
             
             if choice == '1':
                 self._hide_file_menu()
             elif choice == '2':
                 self._unhide_file_menu()
             elif choice == '3':
-                self._list_hidden_files_menu()
+                self._update_hidden_file_menu()
             elif choice == '4':
-                self._verify_email_menu(self.current_user.email)
+                self._list_hidden_files_menu()
             elif choice == '5':
+                self._verify_email_menu(self.current_user.email)
+            elif choice == '6':
                 console.print("[yellow]Logging out...[/yellow]")
+                self.session.clear()
+                self.current_user = None
+                break
+            elif choice == '7':
+                console.print("[yellow]Revoking all sessions...[/yellow]")
+                self.session.revoke_all(self.db, self.current_user)
                 self.current_user = None
                 break
 
@@ -269,6 +290,37 @@ class FileHiderApp:
             console.print(f"[red]File unhiding error: {e}[/red]")
             self._pause()
 
+    def _update_hidden_file_menu(self):
+        """Update hidden file menu"""
+        self._clear_screen()
+        console.print("[bold green]Update Hidden File[/bold green]")
+        
+        hidden_file_id = Prompt.ask("Enter the hidden file id")
+        file_path = Prompt.ask("Enter the full path of the new version of the file")
+        
+        if not os.path.exists(file_path):
+            console.print("[red]File not found[/red]")
+            self._pause()
+            return
+        
+        try:
+            file_hider = FileHider(
+                user_id=self.current_user.id,
+                upload_folder=Config.UPLOAD_FOLDER,
+                hidden_folder=Config.HIDDEN_FOLDER
+            )
+            
+            result = file_hider.update_hidden_file(hidden_file_id, file_path, self.db)
+            console.print(
+                f"[green]File updated successfully. "
+                f"Re-encrypted {result['written']} of {result['chunks']} chunks.[/green]"
+            )
+            self._pause()
+        
+        except Exception as e:
+            console.print(f"[red]File update error: {e}[/red]")
+            self._pause()
+
     def _list_hidden_files_menu(self):
         """List hidden files menu"""
         self._clear_screen()
@@ -299,13 +351,83 @@ class FileHiderApp:
     def run(self):
         """Main application run method"""
         try:
+            # Skip the password prompt if a cached session is still valid
+            self.current_user = self.session.load(self.db)
+            if self.current_user:
+                self._user_dashboard()
             self._main_menu()
         except Exception as e:
             console.print(f"[red]Unexpected error: {e}[/red]")
         finally:
             self.db.close()
 
+def scrub(quarantine=False, resume=True):
+    """Run the integrity scrubber and print its report"""
+    db = SessionLocal()
+    try:
+        scrubber = FileScrubber(
+            hidden_folder=Config.HIDDEN_FOLDER,
+            quarantine_folder=Config.QUARANTINE_FOLDER,
+            state_file=Config.SCRUB_STATE_FILE
+        )
+        report = scrubber.scrub(db, quarantine=quarantine, resume=resume)
+    finally:
+        db.close()
+
+    if report['resumed_from']:
+        console.print(f"[yellow]Resumed after {report['resumed_from']}[/yellow]")
+    console.print(f"[green]Verified {report['verified']} hidden files[/green]")
+    for corrupt in report['corrupt']:
+        console.print(f"[red]Corrupt: {corrupt['id']} ({corrupt['name']}): {corrupt['error']}[/red]")
+    action = "Quarantined" if quarantine else "Orphan"
+    if quarantine and (report['orphan_blobs'] or report['orphan_chunks'] or report['orphan_rows']):
+        console.print(f"[yellow]Quarantine folder: {report['quarantine_folder']}[/yellow]")
+    for name in report['orphan_blobs']:
+        console.print(f"[yellow]{action} blob: {name}[/yellow]")
+    for name in report['orphan_chunks']:
+        console.print(f"[yellow]{action} chunk: {name}[/yellow]")
+    for orphan in report['orphan_rows']:
+        console.print(f"[yellow]{action} row: {orphan['id']} ({orphan['name']})[/yellow]")
+    if report['skipped_recent']:
+        console.print(
+            f"[yellow]Skipped {report['skipped_recent']} unreferenced blobs or chunks "
+            f"modified in the last {Config.SCRUB_ORPHAN_MIN_AGE_SECONDS}s[/yellow]"
+        )
+
+def bench_ciphers():
+    """Compare cipher suite throughput and storage overhead on this machine"""
+    table = Table(title="Cipher suites (64 KiB blobs)")
+    table.add_column("Suite")
+    table.add_column("Encrypt MB/s", justify="right")
+    table.add_column("Decrypt MB/s", justify="right")
+    table.add_column("Overhead", justify="right")
+    
+    for result in benchmark_suites():
+        table.add_row(
+            result['suite'],
+            f"{result['encrypt_mb_s']:.0f}",
+            f"{result['decrypt_mb_s']:.0f}",
+            f"{result['overhead_bytes']} B ({result['overhead_percent']:.1f}%)"
+        )
+    console.print(table)
+
 def main():
+    args = sys.argv[1:]
+    if args and args[0] == 'bench-ciphers':
+        # Benchmarks use throwaway keys, so no secret is needed
+        bench_ciphers()
+        return
+    
+    try:
+        require_secret_key()
+    except RuntimeError as e:
+        console.print(f"[red]{e}[/red]")
+        sys.exit(1)
+    
+    if args and args[0] == 'scrub':
+        scrub(quarantine='--quarantine' in args, resume='--restart' not in args)
+        return
+
     app = FileHiderApp()
     app.run()
 
@@ -0,0 +1,383 @@
+import os
+import json
+import heapq
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy.orm import Session
+
+from db import HiddenFile, HiddenFileChunk
+from config import Config
+from chunking import chunk_digest
+from ciphers import BlobCipher, InvalidCiphertext
+
+
+class RateLimiter:
+    """Token bucket shared by the scrub workers to cap read throughput"""
+
+    def __init__(self, bytes_per_second):
+        self.rate = bytes_per_second
+        self.allowance = bytes_per_second
+        self.last_check = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self, nbytes):
+        """
+        Block until `nbytes` may be read
+
+        Args:
+            nbytes (int): Number of bytes the caller is about to read
+        """
+        if not self.rate:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            self.allowance = min(
+                self.rate,
+                self.allowance + (now - self.last_check) * self.rate
+            )
+            self.last_check = now
+            self.allowance -= nbytes
+            wait = -self.allowance / self.rate if self.allowance < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+
+
+class FileScrubber:
+    """
+    Cross-checks `hidden_files` rows against the blobs in the hidden folder.
+
+    Both sides are walked in `hidden_filename` order and merge-joined, so
+    neither the table nor the directory listing is held in memory. Blobs
+    and chunk directories that have a row are decrypted to verify their
+    authentication tags; blobs without a row, rows without a blob and
+    unreferenced chunks are reported as orphans and, when quarantining,
+    moved out of the way. Orphaned blobs and chunks modified within
+    `orphan_min_age` seconds are left alone, since a hide or update may
+    still be about to commit their rows.
+    """
+
+    BATCH_SIZE = 64
+    SORT_RUN_SIZE = 100_000
+
+    def __init__(self, hidden_folder, quarantine_folder, state_file,
+                 workers=None, max_bytes_per_second=None, orphan_min_age=None):
+        self.hidden_folder = hidden_folder
+        self.quarantine_folder = quarantine_folder
+        self.state_file = state_file
+        self.workers = workers or Config.SCRUB_WORKERS
+        self.orphan_min_age = (
+            orphan_min_age if orphan_min_age is not None
+            else Config.SCRUB_ORPHAN_MIN_AGE_SECONDS
+        )
+        self.rate_limiter = RateLimiter(
+            max_bytes_per_second if max_bytes_per_second is not None
+            else Config.SCRUB_MAX_BYTES_PER_SEC
+        )
+        self.cipher_suite = BlobCipher()
+
+    def _load_checkpoint(self):
+        try:
+            with open(self.state_file, 'r') as state:
+                return json.load(state).get('last_name')
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _save_checkpoint(self, last_name):
+        tmp_path = f"{self.state_file}.tmp"
+        with open(tmp_path, 'w') as state:
+            json.dump({'last_name': last_name}, state)
+        os.replace(tmp_path, self.state_file)
+
+    def _clear_checkpoint(self):
+        if os.path.exists(self.state_file):
+            os.remove(self.state_file)
+
+    def _iter_rows(self, db: Session, after):
+        """Yield `HiddenFile` rows ordered by hidden filename, streamed from the DB"""
+        query = db.query(HiddenFile).order_by(HiddenFile.hidden_filename)
+        if after is not None:
+            query = query.filter(HiddenFile.hidden_filename > after)
+        yield from query.yield_per(500)
+
+    def _iter_blobs(self, after):
+        """
+        Yield blob and chunk directory names in the hidden folder in sorted order
+
+        `os.scandir` returns entries in arbitrary order, so names are sorted
+        in bounded runs that spill to temporary files and are merged back.
+        """
+        runs = []
+        current = []
+
+        def spill():
+            current.sort()
+            run = tempfile.TemporaryFile(mode='w+')
+            run.writelines(f"{name}\n" for name in current)
+            run.seek(0)
+            runs.append(run)
+            current.clear()
+
+        with os.scandir(self.hidden_folder) as entries:
+            for entry in entries:
+                if entry.name.startswith('.'):
+                    continue
+                if after is not None and entry.name <= after:
+                    continue
+                current.append(entry.name)
+                if len(current) >= self.SORT_RUN_SIZE:
+                    spill()
+
+        if not runs:
+            yield from sorted(current)
+            return
+
+        if current:
+            spill()
+        try:
+            streams = [(line.rstrip('\n') for line in run) for run in runs]
+            yield from heapq.merge(*streams)
+        finally:
+            for run in runs:
+                run.close()
+
+    def _merge(self, rows, blobs):
+        """Merge-join rows and blob names, yielding (name, row, has_blob)"""
+        row = next(rows, None)
+        blob = next(blobs, None)
+        while row is not None or blob is not None:
+            if blob is None or (row is not None and row.hidden_filename < blob):
+                yield row.hidden_filename, row, False
+                row = next(rows, None)
+            elif row is None or blob < row.hidden_filename:
+                yield blob, None, True
+                blob = next(blobs, None)
+            else:
+                yield blob, row, True
+                row = next(rows, None)
+                blob = next(blobs, None)
+
+    def _verify_blob(self, path):
+        """
+        Decrypt a blob to check its authentication tag
+
+        Returns:
+            str: None if the blob is intact, otherwise the failure reason
+        """
+        try:
+            self.rate_limiter.acquire(os.path.getsize(path))
+            with open(path, 'rb') as blob:
+                self.cipher_suite.decrypt(blob.read())
+        except InvalidCiphertext as e:
+            return str(e)
+        except OSError as e:
+            return str(e)
+        return None
+
+    def _verify_chunks(self, chunk_dir, digests):
+        """
+        Verify the chunks of a chunked hidden file
+
+        Each chunk is decrypted and its plaintext checked against the digest
+        it is stored under.
+
+        Returns:
+            tuple: (failure reason or None, unreferenced chunk names)
+        """
+        error = None
+        for digest in digests:
+            path = os.path.join(chunk_dir, digest)
+            try:
+                self.rate_limiter.acquire(os.path.getsize(path))
+                with open(path, 'rb') as chunk:
+                    plaintext = self.cipher_suite.decrypt(chunk.read())
+            except InvalidCiphertext as e:
+                error = f"chunk {digest}: {e}"
+                break
+            except OSError as e:
+                error = f"chunk {digest}: {e}"
+                break
+            if chunk_digest(plaintext) != digest:
+                error = f"chunk {digest}: digest mismatch"
+                break
+
+        try:
+            orphans = sorted(set(os.listdir(chunk_dir)) - set(digests))
+        except OSError:
+            orphans = []
+        return error, orphans
+
+    def _is_recent(self, path):
+        """Whether `path` was modified within the orphan grace period"""
+        try:
+            return time.time() - os.stat(path).st_mtime < self.orphan_min_age
+        except OSError:
+            # Vanished since it was listed: something else is working on it
+            return True
+
+    def _verify(self, name, digests):
+        path = os.path.join(self.hidden_folder, name)
+        # Whatever goes wrong with one hidden file is a finding about that
+        # file; it must not stop the scrub of everything after it
+        try:
+            if os.path.isdir(path):
+                return self._verify_chunks(path, digests)
+            return self._verify_blob(path), []
+        except Exception as e:
+            return f"{type(e).__name__}: {e}", []
+
+    def _quarantine_destination(self, *parts):
+        """
+        Free path for a quarantined item inside this run's quarantine folder
+
+        `shutil.move` nests a directory inside an existing one rather than
+        failing, so a taken destination gets a numeric suffix instead.
+        """
+        destination = os.path.join(self.run_quarantine_folder, *parts)
+        candidate = destination
+        suffix = 1
+        while os.path.lexists(candidate):
+            candidate = f"{destination}.{suffix}"
+            suffix += 1
+        os.makedirs(os.path.dirname(candidate), exist_ok=True)
+        return candidate
+
+    def _quarantine_blob(self, name):
+        shutil.move(
+            os.path.join(self.hidden_folder, name),
+            self._quarantine_destination(name)
+        )
+
+    def _quarantine_chunk(self, name, digest):
+        shutil.move(
+            os.path.join(self.hidden_folder, name, digest),
+            self._quarantine_destination(name, digest)
+        )
+
+    def _quarantine_row(self, row, batch_db: Session):
+        os.makedirs(self.run_quarantine_folder, exist_ok=True)
+        manifest = os.path.join(self.run_quarantine_folder, 'orphan_rows.jsonl')
+        with open(manifest, 'a') as orphans:
+            orphans.write(json.dumps({
+                'id': row.id,
+                'user_id': row.user_id,
+                'original_filename': row.original_filename,
+                'hidden_filename': row.hidden_filename,
+                'file_path': row.file_path,
+                'quarantined_at': datetime.utcnow().isoformat()
+            }) + "\n")
+        batch_db.query(HiddenFileChunk).filter(
+            HiddenFileChunk.hidden_file_id == row.id
+        ).delete()
+        batch_db.query(HiddenFile).filter(HiddenFile.id == row.id).delete()
+
+    def _load_digests(self, rows, batch_db: Session):
+        """Map hidden file ids in the batch to their distinct chunk digests"""
+        digests = {row.id: set() for row in rows}
+        if not digests:
+            return digests
+        chunks = batch_db.query(
+            HiddenFileChunk.hidden_file_id,
+            HiddenFileChunk.chunk_digest
+        ).filter(HiddenFileChunk.hidden_file_id.in_(list(digests)))
+        for hidden_file_id, digest in chunks:
+            digests[hidden_file_id].add(digest)
+        return digests
+
+    def _process_batch(self, batch, executor, batch_db: Session, quarantine, report):
+        to_verify = [(name, row) for name, row, has_blob in batch if row and has_blob]
+        digests = self._load_digests([row for _, row in to_verify], batch_db)
+        results = executor.map(
+            lambda item: self._verify(item[0], digests[item[1].id]),
+            to_verify
+        )
+        for (name, row), (error, orphan_chunks) in zip(to_verify, results):
+            report['verified'] += 1
+            if error:
+                report['corrupt'].append({'id': row.id, 'name': name, 'error': error})
+            for digest in orphan_chunks:
+                if self._is_recent(os.path.join(self.hidden_folder, name, digest)):
+                    report['skipped_recent'] += 1
+                    continue
+                report['orphan_chunks'].append(f"{name}/{digest}")
+                if quarantine:
+                    self._quarantine_chunk(name, digest)
+
+        for name, row, has_blob in batch:
+            if row is None:
+                # A chunk directory's mtime moves with every chunk written into it
+                if self._is_recent(os.path.join(self.hidden_folder, name)):
+                    report['skipped_recent'] += 1
+                    continue
+                report['orphan_blobs'].append(name)
+                if quarantine:
+                    self._quarantine_blob(name)
+            elif not has_blob:
+                report['orphan_rows'].append({'id': row.id, 'name': name})
+                if quarantine:
+                    self._quarantine_row(row, batch_db)
+
+        if quarantine:
+            batch_db.commit()
+
+    def scrub(self, db: Session, quarantine=False, resume=True):
+        """
+        Verify every hidden file and find orphaned blobs and rows
+
+        Progress is checkpointed after each batch so an interrupted scrub
+        picks up where it left off.
+
+        Args:
+            db (Session): Database session
+            quarantine (bool): Move orphaned blobs and chunks to a
+                timestamped folder under the quarantine folder and remove
+                orphaned rows, instead of only reporting them
+            resume (bool): Continue from the last checkpoint if one exists
+
+        Returns:
+            dict: Counts of verified files and lists of problems found
+        """
+        after = self._load_checkpoint() if resume else None
+        # Each run quarantines into its own folder so items from earlier
+        # runs are never overwritten or nested into
+        self.run_quarantine_folder = os.path.join(
+            self.quarantine_folder,
+            datetime.utcnow().strftime('%Y%m%dT%H%M%S%fZ')
+        )
+        report = {
+            'resumed_from': after,
+            'quarantine_folder': self.run_quarantine_folder if quarantine else None,
+            'verified': 0,
+            'corrupt': [],
+            'orphan_blobs': [],
+            'orphan_chunks': [],
+            'orphan_rows': [],
+            'skipped_recent': 0
+        }
+
+        # Chunk lookups and deletes go through their own session so they do
+        # not disturb the cursor the rows are being streamed from
+        batch_db = Session(bind=db.get_bind())
+        entries = self._merge(self._iter_rows(db, after), self._iter_blobs(after))
+        batch = []
+        try:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                for entry in entries:
+                    batch.append(entry)
+                    if len(batch) >= self.BATCH_SIZE:
+                        self._process_batch(batch, executor, batch_db, quarantine, report)
+                        self._save_checkpoint(batch[-1][0])
+                        batch = []
+                if batch:
+                    self._process_batch(batch, executor, batch_db, quarantine, report)
+        finally:
+            batch_db.close()
+
+        self._clear_checkpoint()
+        return report
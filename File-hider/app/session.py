@@ -0,0 +1,139 @@
+import os
+import stat
+import time
+from collections import OrderedDict
+from sqlalchemy.orm import Session
+
+from auth import AuthManager
+from db import User
+from config import Config
+
+
+class SessionManager:
+    """
+    Caches a signed login token on disk so later runs can skip the password
+
+    The token carries the user's `token_version`; bumping that column
+    revokes every token issued before it. Decoded claims and user rows are
+    kept in memory briefly so repeated checks within one process do not
+    hit the database again.
+    """
+
+    MAX_CACHED_TOKENS = 32
+
+    def __init__(self, session_file=None):
+        self.session_file = session_file or Config.SESSION_FILE
+        self._claims_cache = OrderedDict()
+        self._user_cache = {}
+
+    def _decode(self, token):
+        claims = self._claims_cache.get(token)
+        if claims is None:
+            claims = AuthManager.decode_access_token(token)
+            if claims is None:
+                return None
+            self._claims_cache[token] = claims
+            if len(self._claims_cache) > self.MAX_CACHED_TOKENS:
+                self._claims_cache.popitem(last=False)
+
+        # Cached claims were valid when decoded, but may have expired since
+        if claims.get('exp', 0) <= time.time():
+            self._claims_cache.pop(token, None)
+            return None
+        return claims
+
+    def _get_user(self, user_id, db: Session):
+        cached = self._user_cache.get(user_id)
+        if cached and time.monotonic() - cached[1] < Config.SESSION_CACHE_TTL_SECONDS:
+            return cached[0]
+
+        user = db.query(User).filter_by(id=user_id).first()
+        if user:
+            self._user_cache[user_id] = (user, time.monotonic())
+        return user
+
+    def _read_token(self):
+        # Any problem reading the token just means falling back to a login
+        try:
+            with open(self.session_file, 'r') as session:
+                info = os.fstat(session.fileno())
+                # Refuse a token other users could have read or planted
+                if info.st_mode & (stat.S_IRWXG | stat.S_IRWXO):
+                    return None
+                if hasattr(os, 'getuid') and info.st_uid != os.getuid():
+                    return None
+                return session.read().strip()
+        except (OSError, ValueError):
+            return None
+
+    def save(self, user):
+        """
+        Issue a token for a freshly authenticated user and cache it on disk
+
+        Args:
+            user (User): Authenticated, verified user
+        """
+        token = AuthManager.create_access_token({
+            "sub": str(user.id),
+            "ver": user.token_version or 0
+        })
+
+        session_dir = os.path.dirname(self.session_file)
+        if session_dir:
+            os.makedirs(session_dir, mode=0o700, exist_ok=True)
+        fd = os.open(self.session_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as session:
+            # O_CREAT's mode does not apply to a file that already existed
+            if hasattr(os, 'fchmod'):
+                os.fchmod(session.fileno(), 0o600)
+            session.write(token)
+        self._user_cache[user.id] = (user, time.monotonic())
+
+    def load(self, db: Session):
+        """
+        Resume the cached session, if there is a valid one
+
+        Expired, revoked or tampered tokens are removed.
+
+        Args:
+            db (Session): Database session
+
+        Returns:
+            User: The logged-in user, or None if a password login is needed
+        """
+        token = self._read_token()
+        if not token:
+            return None
+
+        claims = self._decode(token)
+        user = None
+        if claims and str(claims.get('sub', '')).isdigit():
+            user = self._get_user(int(claims['sub']), db)
+
+        if (
+            not user
+            or not user.is_verified
+            or claims.get('ver') != (user.token_version or 0)
+        ):
+            self.clear()
+            return None
+        return user
+
+    def clear(self):
+        """Remove the cached token, logging out this machine only"""
+        if os.path.isfile(self.session_file):
+            os.remove(self.session_file)
+        self._claims_cache.clear()
+
+    def revoke_all(self, db: Session, user):
+        """
+        Invalidate every token issued to a user, on any machine
+
+        Args:
+            db (Session): Database session
+            user (User): User whose sessions are revoked
+        """
+        user.token_version = (user.token_version or 0) + 1
+        db.commit()
+        self._user_cache.pop(user.id, None)
+        self.clear()
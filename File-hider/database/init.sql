@@ -13,6 +13,7 @@ CREATE TABLE users (
     password_hash VARCHAR(255) NOT NULL,
     is_verified BOOLEAN DEFAULT FALSE,
     verification_code VARCHAR(10),
+    token_version INT NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -25,4 +26,15 @@ CREATE TABLE hidden_files (
     file_path VARCHAR(500) NOT NULL,
     hidden_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+-- Content-defined chunks of hidden files, in file order
+CREATE TABLE hidden_file_chunks (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    hidden_file_id INT NOT NULL,
+    seq INT NOT NULL,
+    chunk_digest CHAR(64) NOT NULL,
+    size INT NOT NULL,
+    FOREIGN KEY (hidden_file_id) REFERENCES hidden_files(id),
+    INDEX idx_hidden_file_seq (hidden_file_id, seq)
 );
\ No newline at end of file
@@ -0,0 +1,13 @@
+-- Adds chunked storage for hidden files.
+-- Needed on databases created before hidden_file_chunks was added to init.sql.
+USE file_hider_db;
+
+CREATE TABLE IF NOT EXISTS hidden_file_chunks (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    hidden_file_id INT NOT NULL,
+    seq INT NOT NULL,
+    chunk_digest CHAR(64) NOT NULL,
+    size INT NOT NULL,
+    FOREIGN KEY (hidden_file_id) REFERENCES hidden_files(id),
+    INDEX idx_hidden_file_seq (hidden_file_id, seq)
+);
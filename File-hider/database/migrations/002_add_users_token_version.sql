@@ -0,0 +1,5 @@
+-- Adds the per-user token version used to revoke cached login sessions.
+-- Needed on databases created before token_version was added to init.sql.
+USE file_hider_db;
+
+ALTER TABLE users ADD COLUMN token_version INT NOT NULL DEFAULT 0;
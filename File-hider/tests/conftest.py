@@ -0,0 +1,57 @@
+import os
+import sys
+
+from cryptography.fernet import Fernet
+
+# Config is read at import time, so the environment must be set first
+os.environ.setdefault('SECRET_KEY', Fernet.generate_key().decode())
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'app'))
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from db import Base, User
+from file_operations import FileHider
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+
+    # Enforce foreign keys like the MySQL schema does
+    @event.listens_for(engine, 'connect')
+    def enable_foreign_keys(connection, _):
+        connection.execute('PRAGMA foreign_keys=ON')
+
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        username='alice',
+        email='alice@example.com',
+        password_hash='hash',
+        is_verified=True
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def file_hider(tmp_path, user):
+    upload_folder = tmp_path / 'uploads'
+    hidden_folder = tmp_path / 'hidden'
+    upload_folder.mkdir()
+    hidden_folder.mkdir()
+    return FileHider(
+        user_id=user.id,
+        upload_folder=str(upload_folder),
+        hidden_folder=str(hidden_folder)
+    )
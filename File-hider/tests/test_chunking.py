@@ -0,0 +1,80 @@
+import hashlib
+import io
+import mmap
+import os
+
+from chunking import iter_chunks, chunk_digest, MIN_CHUNK_SIZE, MAX_CHUNK_SIZE
+
+
+def _digests(data):
+    return [chunk_digest(chunk) for chunk in iter_chunks(io.BytesIO(data))]
+
+
+def test_chunks_cover_stream_in_order():
+    data = os.urandom(3 * 1024 * 1024 + 123)
+
+    chunks = list(iter_chunks(io.BytesIO(data)))
+
+    assert b''.join(chunks) == data
+    assert all(len(chunk) <= MAX_CHUNK_SIZE for chunk in chunks)
+    assert all(len(chunk) >= MIN_CHUNK_SIZE for chunk in chunks[:-1])
+
+
+def test_file_and_memory_chunking_agree(tmp_path):
+    data = os.urandom(1024 * 1024)
+    path = tmp_path / 'data.bin'
+    path.write_bytes(data)
+
+    with open(path, 'rb') as file:
+        from_file = list(iter_chunks(file))
+
+    assert from_file == list(iter_chunks(io.BytesIO(data)))
+
+
+def test_empty_input_has_no_chunks(tmp_path):
+    path = tmp_path / 'empty'
+    path.write_bytes(b'')
+
+    with open(path, 'rb') as file:
+        assert list(iter_chunks(file)) == []
+    assert list(iter_chunks(io.BytesIO(b''))) == []
+
+
+def test_local_edit_only_changes_nearby_chunks():
+    data = os.urandom(4 * 1024 * 1024)
+    edited = bytearray(data)
+    edited[100:100] = b'inserted'
+    edited[2_000_000:2_000_010] = b'x' * 10
+
+    before = _digests(data)
+    after = _digests(bytes(edited))
+
+    assert len(set(after) - set(before)) <= 4
+    assert len(set(before) & set(after)) >= len(before) - 4
+
+
+def test_chunk_digest_is_keyed():
+    assert chunk_digest(b'chunk') == chunk_digest(b'chunk')
+    assert chunk_digest(b'chunk') != hashlib.sha256(b'chunk').hexdigest()
+
+
+def test_mapping_is_closed_when_caller_stops_early(tmp_path, monkeypatch):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(os.urandom(1024 * 1024))
+    mappings = []
+
+    class RecordingMmap(mmap.mmap):
+        def __new__(cls, *args, **kwargs):
+            mapping = super().__new__(cls, *args, **kwargs)
+            mappings.append(mapping)
+            return mapping
+
+    monkeypatch.setattr(mmap, 'mmap', RecordingMmap)
+
+    with open(path, 'rb') as file:
+        chunks = iter_chunks(file)
+        next(chunks)
+        chunks.close()
+
+    assert len(mappings) == 1
+    assert mappings[0].closed
@@ -0,0 +1,81 @@
+import pytest
+from cryptography.fernet import Fernet
+
+from config import Config
+from ciphers import BlobCipher, InvalidCiphertext, SUITES, BLOB_MAGIC
+
+DATA = b'hidden file contents' * 100
+
+
+@pytest.mark.parametrize('suite_name', sorted(SUITES))
+def test_roundtrip(suite_name):
+    blob = BlobCipher(suite_name).encrypt(DATA)
+
+    assert BlobCipher(suite_name).decrypt(blob) == DATA
+
+
+@pytest.mark.parametrize('suite_name', ['aes-256-gcm', 'chacha20-poly1305'])
+def test_aead_blobs_are_raw_binary(suite_name):
+    blob = BlobCipher(suite_name).encrypt(DATA)
+
+    assert blob.startswith(BLOB_MAGIC)
+    assert len(blob) - len(DATA) == 31
+
+
+@pytest.mark.parametrize('suite_name', sorted(SUITES))
+def test_any_suite_reads_any_blob(suite_name):
+    blob = BlobCipher('chacha20-poly1305').encrypt(DATA)
+
+    assert BlobCipher(suite_name).decrypt(blob) == DATA
+
+
+def test_fernet_fallback_for_existing_blobs():
+    legacy = Fernet(Config.SECRET_KEY).encrypt(DATA)
+
+    assert BlobCipher('aes-256-gcm').decrypt(legacy) == DATA
+
+
+@pytest.mark.parametrize('suite_name', sorted(SUITES))
+def test_tampered_blob_is_rejected(suite_name):
+    blob = bytearray(BlobCipher(suite_name).encrypt(DATA))
+    blob[-1] ^= 1
+
+    with pytest.raises(InvalidCiphertext):
+        BlobCipher().decrypt(bytes(blob))
+
+
+@pytest.mark.parametrize('blob', [
+    b'FH',
+    b'FH\x01',
+    b'FH\x01abc',
+    b'FH\x02' + b'\x00' * 27,
+])
+def test_truncated_blob_is_rejected(blob):
+    with pytest.raises(InvalidCiphertext):
+        BlobCipher().decrypt(blob)
+
+
+def test_unknown_suite_id_is_rejected():
+    with pytest.raises(InvalidCiphertext, match='unknown cipher suite'):
+        BlobCipher().decrypt(b'FH\x7f' + b'\x00' * 64)
+
+
+def test_unknown_suite_name_is_refused():
+    with pytest.raises(ValueError):
+        BlobCipher('rot13')
+
+
+@pytest.mark.parametrize('secret_key', ['', 'your-secret-key'])
+def test_placeholder_secret_key_is_refused(monkeypatch, secret_key):
+    monkeypatch.setattr(Config, 'SECRET_KEY', secret_key)
+
+    with pytest.raises(RuntimeError, match='SECRET_KEY'):
+        BlobCipher('aes-256-gcm').encrypt(DATA)
+
+
+@pytest.mark.parametrize('blob', [b'', b'\x00' * 64])
+def test_damaged_blob_without_fernet_key_is_rejected(monkeypatch, blob):
+    monkeypatch.setattr(Config, 'SECRET_KEY', 'x' * 40)
+
+    with pytest.raises(InvalidCiphertext, match='not a supported blob format'):
+        BlobCipher('aes-256-gcm').decrypt(blob)
@@ -0,0 +1,95 @@
+import os
+
+from db import HiddenFile, HiddenFileChunk
+
+
+def _write(path, data):
+    with open(path, 'wb') as file:
+        file.write(data)
+    return str(path)
+
+
+def _read(path):
+    with open(path, 'rb') as file:
+        return file.read()
+
+
+def test_hide_update_unhide_roundtrip(tmp_path, db, file_hider):
+    original = os.urandom(2 * 1024 * 1024)
+    source = _write(tmp_path / 'image.bin', original)
+
+    hidden_filename = file_hider.hide_file(source, db)
+    record = db.query(HiddenFile).filter_by(hidden_filename=hidden_filename).one()
+    file_id = record.id
+    assert not os.path.exists(source)
+    assert os.path.isdir(record.file_path)
+
+    edited = bytearray(original)
+    edited[1_000_000:1_000_016] = b'x' * 16
+    source = _write(tmp_path / 'image.bin', bytes(edited))
+    result = file_hider.update_hidden_file(file_id, source, db)
+
+    assert 0 < result['written'] < result['chunks']
+    assert db.query(HiddenFile).filter_by(id=file_id).one().hidden_filename == hidden_filename
+    stored = set(os.listdir(record.file_path))
+    referenced = {
+        chunk.chunk_digest
+        for chunk in db.query(HiddenFileChunk).filter_by(hidden_file_id=file_id)
+    }
+    assert stored == referenced
+
+    restored_path = file_hider.unhide_file(file_id, db)
+
+    assert _read(restored_path) == bytes(edited)
+    assert not os.path.exists(record.file_path)
+    assert db.query(HiddenFile).count() == 0
+    assert db.query(HiddenFileChunk).count() == 0
+
+
+def test_unhide_empty_file(tmp_path, db, file_hider):
+    hidden_filename = file_hider.hide_file(_write(tmp_path / 'empty', b''), db)
+    record = db.query(HiddenFile).filter_by(hidden_filename=hidden_filename).one()
+
+    restored_path = file_hider.unhide_file(record.id, db)
+
+    assert _read(restored_path) == b''
+
+
+def test_unhide_rejects_swapped_chunks(tmp_path, db, file_hider):
+    source = _write(tmp_path / 'data.bin', os.urandom(1024 * 1024))
+    hidden_filename = file_hider.hide_file(source, db)
+    record = db.query(HiddenFile).filter_by(hidden_filename=hidden_filename).one()
+    first, second = db.query(HiddenFileChunk).filter_by(
+        hidden_file_id=record.id
+    ).order_by(HiddenFileChunk.seq).limit(2)
+
+    first_path = os.path.join(record.file_path, first.chunk_digest)
+    second_path = os.path.join(record.file_path, second.chunk_digest)
+    first_blob, second_blob = _read(first_path), _read(second_path)
+    _write(first_path, second_blob)
+    _write(second_path, first_blob)
+
+    assert file_hider.unhide_file(record.id, db) is None
+    assert os.path.isdir(record.file_path)
+    assert db.query(HiddenFile).count() == 1
+    assert not os.path.exists(os.path.join(file_hider.upload_folder, 'data.bin'))
+
+
+def test_update_converts_single_blob_file(tmp_path, db, file_hider):
+    hidden_path = os.path.join(file_hider.hidden_folder, 'legacy')
+    _write(hidden_path, file_hider.cipher_suite.encrypt(b'old contents'))
+    record = HiddenFile(
+        user_id=file_hider.user_id,
+        original_filename='notes.txt',
+        hidden_filename='legacy',
+        file_path=hidden_path
+    )
+    db.add(record)
+    db.commit()
+
+    source = _write(tmp_path / 'notes.txt', b'new contents')
+    file_hider.update_hidden_file(record.id, source, db)
+
+    assert not os.path.exists(hidden_path)
+    assert os.path.isdir(record.file_path)
+    assert _read(file_hider.unhide_file(record.id, db)) == b'new contents'
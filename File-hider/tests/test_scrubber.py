@@ -0,0 +1,160 @@
+import os
+import time
+
+import pytest
+
+from config import Config
+from db import HiddenFile, HiddenFileChunk
+from scrubber import FileScrubber
+
+
+@pytest.fixture
+def scrubber(tmp_path, file_hider):
+    return FileScrubber(
+        hidden_folder=file_hider.hidden_folder,
+        quarantine_folder=str(tmp_path / 'quarantine'),
+        state_file=str(tmp_path / 'scrub_state.json'),
+        workers=2,
+        max_bytes_per_second=0,
+        orphan_min_age=60
+    )
+
+
+def _hide(tmp_path, db, file_hider, size=512 * 1024):
+    source = tmp_path / 'source.bin'
+    source.write_bytes(os.urandom(size))
+    hidden_filename = file_hider.hide_file(str(source), db)
+    return db.query(HiddenFile).filter_by(hidden_filename=hidden_filename).one()
+
+
+def _age(path, seconds=3600):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_intact_files_are_verified(tmp_path, db, file_hider, scrubber):
+    _hide(tmp_path, db, file_hider)
+
+    report = scrubber.scrub(db)
+
+    assert report['verified'] == 1
+    assert not report['corrupt']
+    assert not report['orphan_blobs']
+    assert not report['orphan_chunks']
+    assert not report['orphan_rows']
+
+
+def test_truncated_chunk_is_reported(tmp_path, db, file_hider, scrubber):
+    record = _hide(tmp_path, db, file_hider)
+    chunk = db.query(HiddenFileChunk).filter_by(hidden_file_id=record.id).first()
+    with open(os.path.join(record.file_path, chunk.chunk_digest), 'wb') as blob:
+        blob.write(b'FH\x01abc')
+
+    report = scrubber.scrub(db)
+
+    assert [corrupt['id'] for corrupt in report['corrupt']] == [record.id]
+
+
+def test_recent_orphans_are_left_alone(tmp_path, db, file_hider, scrubber):
+    record = _hide(tmp_path, db, file_hider)
+    orphan_dir = os.path.join(file_hider.hidden_folder, 'in-flight-hide')
+    os.mkdir(orphan_dir)
+    with open(os.path.join(record.file_path, 'in-flight-chunk'), 'wb') as chunk:
+        chunk.write(b'data')
+
+    report = scrubber.scrub(db, quarantine=True)
+
+    assert report['skipped_recent'] == 2
+    assert os.path.isdir(orphan_dir)
+    assert os.path.exists(os.path.join(record.file_path, 'in-flight-chunk'))
+
+
+def test_old_orphans_are_quarantined(tmp_path, db, file_hider, scrubber):
+    record = _hide(tmp_path, db, file_hider)
+    orphan_blob = os.path.join(file_hider.hidden_folder, 'crashed-hide')
+    orphan_chunk = os.path.join(record.file_path, 'crashed-update-chunk')
+    for path in (orphan_blob, orphan_chunk):
+        with open(path, 'wb') as blob:
+            blob.write(b'data')
+        _age(path)
+
+    report = scrubber.scrub(db, quarantine=True)
+
+    assert report['orphan_blobs'] == ['crashed-hide']
+    assert report['orphan_chunks'] == [f"{record.hidden_filename}/crashed-update-chunk"]
+    assert not os.path.exists(orphan_blob)
+    assert not os.path.exists(orphan_chunk)
+    assert os.path.exists(os.path.join(report['quarantine_folder'], 'crashed-hide'))
+
+
+def test_orphan_rows_are_quarantined(tmp_path, db, file_hider, scrubber):
+    record = _hide(tmp_path, db, file_hider)
+    record_id = record.id
+    for chunk in os.listdir(record.file_path):
+        os.remove(os.path.join(record.file_path, chunk))
+    os.rmdir(record.file_path)
+
+    report = scrubber.scrub(db, quarantine=True)
+
+    assert [orphan['id'] for orphan in report['orphan_rows']] == [record_id]
+    db.expire_all()
+    assert db.query(HiddenFile).count() == 0
+    assert db.query(HiddenFileChunk).count() == 0
+    assert os.path.exists(os.path.join(report['quarantine_folder'], 'orphan_rows.jsonl'))
+
+
+def test_unexpected_errors_are_reported_and_scrub_completes(
+        tmp_path, db, file_hider, scrubber, monkeypatch):
+    broken = _hide(tmp_path, db, file_hider)
+    _hide(tmp_path, db, file_hider)
+    verify_chunks = scrubber._verify_chunks
+
+    def failing_verify_chunks(chunk_dir, digests):
+        if chunk_dir == broken.file_path:
+            raise MemoryError("blob too large")
+        return verify_chunks(chunk_dir, digests)
+
+    monkeypatch.setattr(scrubber, '_verify_chunks', failing_verify_chunks)
+
+    report = scrubber.scrub(db)
+
+    assert report['verified'] == 2
+    assert [corrupt['id'] for corrupt in report['corrupt']] == [broken.id]
+    assert 'MemoryError' in report['corrupt'][0]['error']
+    assert not os.path.exists(scrubber.state_file)
+
+
+def test_emptied_chunk_without_fernet_key_is_reported(
+        tmp_path, db, file_hider, scrubber, monkeypatch):
+    monkeypatch.setattr(Config, 'SECRET_KEY', 'x' * 40)
+    record = _hide(tmp_path, db, file_hider)
+    chunk = db.query(HiddenFileChunk).filter_by(hidden_file_id=record.id).first()
+    open(os.path.join(record.file_path, chunk.chunk_digest), 'wb').close()
+
+    report = scrubber.scrub(db)
+
+    assert [corrupt['id'] for corrupt in report['corrupt']] == [record.id]
+
+
+def test_later_quarantines_do_not_nest_into_earlier_ones(tmp_path, db, file_hider, scrubber):
+    record = _hide(tmp_path, db, file_hider)
+    stray_chunk = os.path.join(record.file_path, 'stray-chunk')
+    with open(stray_chunk, 'wb') as chunk:
+        chunk.write(b'data')
+    _age(stray_chunk)
+    first = scrubber.scrub(db, quarantine=True)
+
+    # The whole directory later loses its row and becomes an orphan
+    db.query(HiddenFileChunk).delete()
+    db.query(HiddenFile).delete()
+    db.commit()
+    _age(record.file_path)
+    second = scrubber.scrub(db, quarantine=True)
+
+    assert first['quarantine_folder'] != second['quarantine_folder']
+    assert os.path.exists(
+        os.path.join(first['quarantine_folder'], record.hidden_filename, 'stray-chunk')
+    )
+    moved = os.path.join(second['quarantine_folder'], record.hidden_filename)
+    assert os.path.isdir(moved)
+    assert not os.path.exists(os.path.join(moved, record.hidden_filename))
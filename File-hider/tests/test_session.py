@@ -0,0 +1,60 @@
+import os
+
+import pytest
+
+from session import SessionManager
+
+
+@pytest.fixture
+def session_file(tmp_path):
+    return str(tmp_path / 'session_dir' / 'session')
+
+
+def test_saved_session_resumes(db, user, session_file):
+    SessionManager(session_file).save(user)
+
+    assert os.stat(session_file).st_mode & 0o777 == 0o600
+    assert SessionManager(session_file).load(db).id == user.id
+
+
+def test_missing_session_needs_login(db, session_file):
+    assert SessionManager(session_file).load(db) is None
+
+
+def test_unreadable_session_path_needs_login(db, session_file):
+    os.makedirs(session_file)
+
+    assert SessionManager(session_file).load(db) is None
+
+
+def test_shared_session_file_is_ignored(db, user, session_file):
+    SessionManager(session_file).save(user)
+    os.chmod(session_file, 0o644)
+
+    assert SessionManager(session_file).load(db) is None
+
+
+def test_revoked_sessions_are_rejected(db, user, session_file, tmp_path):
+    other_machine = str(tmp_path / 'other' / 'session')
+    SessionManager(other_machine).save(user)
+
+    SessionManager(session_file).revoke_all(db, user)
+
+    assert SessionManager(other_machine).load(db) is None
+    assert not os.path.exists(other_machine)
+
+
+def test_tampered_token_is_rejected(db, user, session_file):
+    SessionManager(session_file).save(user)
+    with open(session_file, 'a') as session:
+        session.write('x')
+
+    assert SessionManager(session_file).load(db) is None
+
+
+def test_relative_session_file(db, user, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    SessionManager('session').save(user)
+
+    assert SessionManager('session').load(db).id == user.id